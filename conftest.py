@@ -1,4 +1,3 @@
-import re
 from doctest import DocTestRunner
 from typing import Callable, Iterator
 
@@ -7,32 +6,41 @@ import pytest
 from thatway import Setting, SettingsManager, clear
 
 
+def _match_strings(s1: str, s2: str) -> bool:
+    """Match two strings, ignoring differences in spaces and newlines"""
+    return s1.split() == s2.split()
+
+
 @pytest.fixture
 def match_strings() -> Callable[[str, str], bool]:
-    """Match two strings, including stripping of newlines"""
-    regex1 = re.compile(r"(  )+")  # Remove blocks of 2-spaces
+    """Match two strings, ignoring differences in spaces and newlines"""
+    return _match_strings
 
-    def _match_strings(s1: str, s2: str) -> bool:
-        subbed1 = regex1.sub("", s1).strip()  # remove space at the ends
-        subbed2 = regex1.sub("", s2).strip()
 
-        return subbed1 == subbed2
+#: The initial state of the settings manager, which is restored for each test
+_INITIAL_STATE = dict(SettingsManager().__dict__)
 
-    _match_strings.__doc__ = match_strings.__doc__
-    return _match_strings
+
+@pytest.fixture(scope="session")
+def _settings_root() -> SettingsManager:
+    """The root settings manager shared by all tests"""
+    return SettingsManager()
 
 
 @pytest.fixture
-def settings() -> Iterator[SettingsManager]:
+def settings(_settings_root: SettingsManager) -> Iterator[SettingsManager]:
     """Retrieve and reset the settings object"""
-    manager = SettingsManager()
-    clear(manager)
-    yield manager
+    _settings_root.__dict__.clear()
+    _settings_root.__dict__.update(_INITIAL_STATE)
+    yield _settings_root
 
 
-@pytest.fixture
-def settings_set1(settings: SettingsManager) -> Iterator[SettingsManager]:
-    """Retrieve a settings object configure with data (set 1)"""
+@pytest.fixture(scope="session")
+def _settings_set1_state(_settings_root: SettingsManager) -> dict:
+    """Build the settings (set 1) once and return the root manager's state"""
+    settings = _settings_root
+    settings.__dict__.clear()
+    settings.__dict__.update(_INITIAL_STATE)
 
     class TestClass:
         attribute = Setting(3, "My attribute")
@@ -40,6 +48,18 @@ def settings_set1(settings: SettingsManager) -> Iterator[SettingsManager]:
 
     settings.database_ip = Setting("128.0.0.1", "IP address of database")
 
+    return dict(settings.__dict__)
+
+
+@pytest.fixture
+def settings_set1(
+    settings: SettingsManager, _settings_set1_state: dict
+) -> Iterator[SettingsManager]:
+    """Retrieve a settings object configure with data (set 1).
+
+    The settings are shared between tests, which should only read them.
+    """
+    settings.__dict__.update(_settings_set1_state)
     yield settings
 
 
@@ -48,6 +68,9 @@ def settings_set1(settings: SettingsManager) -> Iterator[SettingsManager]:
 
 orig_run = DocTestRunner.run
 
+#: The closing code block fence of Markdown doctests
+_FENCE = "```\n"
+
 
 def run(self, test, *args, **kwargs):
     # reset settings before running doctests
@@ -55,9 +78,11 @@ def run(self, test, *args, **kwargs):
     clear(manager)
 
     for example in test.examples:
-        # Remove ```
-        example.want = example.want.replace("```\n", "")
-        example.exc_msg = example.exc_msg and example.exc_msg.replace("```\n", "")
+        # Remove ```, only from the examples that have them
+        if _FENCE in example.want:
+            example.want = example.want.replace(_FENCE, "")
+        if example.exc_msg and _FENCE in example.exc_msg:
+            example.exc_msg = example.exc_msg.replace(_FENCE, "")
 
     return orig_run(self, test, *args, **kwargs)
 
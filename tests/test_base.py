@@ -1,5 +1,7 @@
 """Tests for Setting and SettingsManager classes"""
 
+import copy
+
 import pytest
 
 from thatway import ConditionFailure, Setting, SettingException, SettingsManager
@@ -64,6 +66,76 @@ def test_setting_delete(settings: SettingsManager) -> None:
     assert test.s == "t"
 
 
+def test_setting_instance_values(settings: SettingsManager) -> None:
+    """Test that instance values are stored separately for each setting"""
+
+    class Test:
+        a = Setting(1, "First setting")
+        b = Setting(2, "Second setting")
+
+    test = Test()
+
+    # Reading values does not create the instance settings
+    assert test.a == 1
+    assert Setting._setting_attribute not in test.__dict__
+
+    test.a = 3
+
+    assert test.a == 3
+    assert test.b == 2
+
+
+def test_setting_copy(settings: SettingsManager) -> None:
+    """Test the :cls:`Setting` :meth:`__copy__` method"""
+
+    class Test:
+        s = Setting(3, "An int", is_positive)
+
+    setting = Test.s
+    cp = copy.copy(setting)
+
+    assert cp is not setting
+    assert cp.value == setting.value
+    assert cp.desc == setting.desc
+    assert cp.conditions == setting.conditions
+    assert cp.__location__ == setting.__location__
+
+
+def test_setting_copy_subclass(settings: SettingsManager) -> None:
+    """Test the :cls:`Setting` :meth:`__copy__` method for subclasses with their own
+    attributes"""
+
+    class UnitSetting(Setting):
+        def __init__(self, value: int, desc: str, unit: str) -> None:
+            super().__init__(value, desc)
+            self.unit = unit
+
+    settings.width = UnitSetting(3, "Width", unit="px")
+
+    assert isinstance(settings.width, UnitSetting)
+    assert settings.width.unit == "px"
+    assert settings.width.value == 3
+
+
+def test_setting_copy_subclass_slots(settings: SettingsManager) -> None:
+    """Test the :cls:`Setting` :meth:`__copy__` method for subclasses with their own
+    slots"""
+
+    class UnitSetting(Setting):
+        __slots__ = ("unit",)
+
+        def __init__(self, value: int, desc: str, unit: str) -> None:
+            super().__init__(value, desc)
+            self.unit = unit
+
+    settings.width = UnitSetting(3, "Width", unit="px")
+
+    assert isinstance(settings.width, UnitSetting)
+    assert settings.width.unit == "px"
+    assert settings.width.value == 3
+    assert settings.width.desc == "Width"
+
+
 def test_setting_insert(settings: SettingsManager) -> None:
     """Test the :cls:`Setting` :meth:`_insert` method."""
 
@@ -103,6 +175,13 @@ def test_setting_validate_cls_creation(settings: SettingsManager) -> None:
 
             s = Setting(-3, is_positive)
 
+    # Conditions must be functions
+    with pytest.raises(SettingException):
+
+        class Test3:
+
+            s = Setting(3, "An int", 3)  # type: ignore
+
 
 def test_setting_validate_instantiation(settings: SettingsManager) -> None:
     """Test the :cls:`Setting` :meth:`validate` method for class instantiation"""
@@ -127,6 +206,7 @@ def test_setting_validate_change(settings: SettingsManager) -> None:
     # Changing the default to an invalid value doesn't work
     with pytest.raises(ConditionFailure):
         Test.s.value = -3
+    assert Test.s.value == 3
 
     # Change to an invalid value doesn't work
     test = Test()
@@ -139,6 +219,24 @@ def test_settings_manager_new(settings: SettingsManager) -> None:
     assert id(SettingsManager()) == id(settings)  # same object
     assert id(SettingsManager(base=False)) != id(settings)  # different object
 
+    # The base flag is not stored in the namespace
+    assert "base" not in SettingsManager(base=False).__dict__
+
+
+def test_settings_manager_eq(settings: SettingsManager) -> None:
+    """Test the SettingsManager __eq__ method"""
+    sub1 = SettingsManager(base=False)
+    sub2 = SettingsManager(base=False)
+
+    assert settings == settings
+    assert sub1 == sub2  # both empty
+
+    sub1.setting = Setting(5, "A setting")
+    assert sub1 != sub2
+
+    # The names of sub-managers aren't compared
+    assert settings.sub_a == settings.sub_b  # type: ignore
+
 
 def test_settings_manager_iter(settings_set1: SettingsManager) -> None:
     """Test the SettingsManager __iter__ and __len__ methods"""
@@ -186,6 +284,30 @@ def test_settings_manager_set(settings: SettingsManager) -> None:
         module_settings.TestClass = Setting("new value", "a new valuel")
 
 
+def test_settings_manager_set_manager(settings: SettingsManager) -> None:
+    """Test the SettingsManager __set__ method with settings managers"""
+    # 1. Insert an empty settings manager
+    settings.empty = SettingsManager(base=False)
+    assert settings.empty is not settings
+    assert settings.empty.full_name == "empty"
+
+    # 2. Insert a settings manager with settings and sub-managers
+    grp = SettingsManager(base=False)
+    grp.setting = Setting(5, "A setting")
+    grp.sub.setting = Setting("a", "A sub-manager setting")  # type: ignore
+    settings.grp = grp
+
+    assert settings.grp is not settings
+    assert settings.grp is not grp
+    assert settings.grp.setting.full_name == "grp.setting"  # type: ignore
+    assert settings.grp.sub.setting.full_name == "grp.sub.setting"  # type: ignore
+    assert settings.grp.setting.value == 5  # type: ignore
+
+    # The original settings manager is not changed
+    assert grp.parent is None
+    assert grp.setting.full_name == "setting"  # type: ignore
+
+
 def test_settings_manager_get(settings: SettingsManager) -> None:
     """Test the SettingsManager __getattribute__ method."""
     # Retrieve any attribute returns an empty setting
@@ -193,6 +315,15 @@ def test_settings_manager_get(settings: SettingsManager) -> None:
     assert isinstance(sub_manager, SettingsManager)
     assert len(sub_manager) == 0
 
+    # Invalid names and dunder names do not create sub-managers
+    assert not hasattr(settings, "not valid")
+    assert not hasattr(settings, "__wrapped__")
+
+    # Names of the metaclass's attributes are not reserved
+    assert isinstance(settings.mro, SettingsManager)
+    settings.mro.setting = Setting(5, "A setting")  # type: ignore
+    assert settings.mro.setting.full_name == "mro.setting"  # type: ignore
+
     # This sub-manager can be replaced as long as it's empty
     settings.sub = Setting(5, "A setting")
 
@@ -236,3 +367,39 @@ def test_settings_manager_hierarchy_name(settings_set1: SettingsManager) -> None
     assert settings.conftest.TestClass.attribute.name == "attribute"  # type: ignore
     assert settings.conftest.TestClass.attribute2.name == "attribute2"  # type: ignore
     assert settings.database_ip.name == "database_ip"
+
+
+def test_settings_manager_hierarchy_full_name(settings_set1: SettingsManager) -> None:
+    """Test the SettingsHierarchy full_name property"""
+    settings = settings_set1
+
+    assert settings.full_name == ""
+    assert settings.conftest.TestClass.full_name == "conftest.TestClass"  # type: ignore
+    assert (
+        settings.conftest.TestClass.attribute.full_name  # type: ignore
+        == "conftest.TestClass.attribute"
+    )
+    assert settings.database_ip.full_name == "database_ip"
+
+    # Settings that are not in a settings manager have no name or parent
+    setting = Setting(1, "A setting")
+    assert setting.name == ""
+    assert setting.parent is None
+
+
+def test_settings_manager_hierarchy_reserved_names(settings: SettingsManager) -> None:
+    """Test that settings can use the names of private hierarchy attributes"""
+
+    class Plugin:
+        _name = Setting("default", "A private name setting")
+        _parent = Setting("parent", "A private parent setting")
+
+    module_settings = getattr(settings, Plugin.__module__)
+    assert module_settings.Plugin._name.value == "default"
+    assert module_settings.Plugin._parent.value == "parent"
+    assert module_settings.Plugin.name == "Plugin"
+
+    settings.sub._name = Setting("x", "A sub-manager setting")  # type: ignore
+    assert settings.sub._name.value == "x"  # type: ignore
+    assert settings.sub.name == "sub"  # type: ignore
+    assert len(settings.sub) == 1  # type: ignore
@@ -20,6 +20,9 @@ def test_greater_than() -> None:
     assert greater_than(3.0)(5.0)
     assert not greater_than(3.0)(2.0)
 
+    # docstring
+    assert greater_than(3).__doc__ == "Value must be greater than 3"
+
 
 def test_lesser_than() -> None:
     """Test the lesser_than function"""
@@ -31,6 +34,9 @@ def test_lesser_than() -> None:
     assert lesser_than(5.0)(3.0)
     assert not lesser_than(2.0)(3.0)
 
+    # docstring
+    assert lesser_than(5).__doc__ == "Value must be lesser than 5"
+
 
 def test_is_positive() -> None:
     """Test the is_positive function"""
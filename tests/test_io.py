@@ -2,12 +2,22 @@
 Test SettingsManager io functions.
 """
 
+from datetime import datetime
+from io import BytesIO, StringIO
 from pathlib import Path
 from typing import Callable
 
 import pytest
 
 from thatway import Setting, SettingException, SettingsManager, load, pprint, save
+import thatway.io
+from thatway.io import (
+    FileType,
+    _parse_cache,
+    clear_parse_cache,
+    load_toml,
+    parse_toml,
+)
 
 
 def test_settings_manager_pprint(
@@ -29,6 +39,30 @@ def test_settings_manager_pprint(
     assert match_strings(stdout, key)
 
 
+def test_settings_manager_pprint_types(
+    settings: SettingsManager,
+    match_strings: Callable[[str, str], bool],
+    capsys: pytest.CaptureFixture,
+) -> None:
+    """Test the pretty-print of descriptions for different value types and settings
+    without descriptions"""
+    settings.flag = Setting(True, "A boolean")
+    settings.ratio = Setting(0.5, "A float")
+    settings.names = Setting(["a", "b"], "A list")
+    settings.count = Setting(3)  # no description
+    pprint(settings)
+
+    stdout = capsys.readouterr().out
+    key = """
+    flag = true # A boolean
+    ratio = 0.5 # A float
+    names = ["a", "b"] # A list
+    count = 3
+    """
+
+    assert match_strings(stdout, key)
+
+
 def test_settings_manager_load_toml(settings: SettingsManager, tmp_path: Path) -> None:
     """Test the SettingsManager load_toml method."""
 
@@ -63,6 +97,131 @@ def test_settings_manager_load_toml(settings: SettingsManager, tmp_path: Path) -
     assert module_settings.TestClass.attribute2.value == "new string"
 
 
+def test_settings_manager_load_toml_types(
+    settings: SettingsManager, tmp_path: Path
+) -> None:
+    """Test the SettingsManager load_toml method with different value types."""
+    settings.start = Setting(datetime(2024, 1, 1, 12, 0), "A start datetime")
+    settings.names = Setting(["a"], "A list of names")
+    settings.ratio = Setting(0.5, "A float")
+    settings.nested = Setting({"a": [1]}, "A table with nested containers")
+
+    tmp_toml = tmp_path / "test.toml"
+    tmp_toml.write_text(
+        """
+    start = 2024-02-03T04:05:06
+    names = ["b", "c"]
+    ratio = 1
+    nested = {a = [1, 2], b = [{c = 3}]}
+    """
+    )
+
+    load(tmp_toml, settings)
+
+    assert settings.start.value == datetime(2024, 2, 3, 4, 5, 6)
+    assert settings.ratio.value == 1.0
+    assert isinstance(settings.ratio.value, float)
+
+    # Containers, including nested containers, are copied from the parsed document
+    doc = _parse_cache[str(tmp_toml.absolute())][1]
+    assert settings.names.value == ["b", "c"]
+    assert settings.names.value is not doc["names"]
+    assert settings.nested.value == {"a": [1, 2], "b": [{"c": 3}]}
+    assert settings.nested.value["a"] is not doc["nested"]["a"]
+    assert settings.nested.value["b"][0] is not doc["nested"]["b"][0]
+
+
+def test_settings_manager_load_filetype(
+    settings: SettingsManager, tmp_path: Path
+) -> None:
+    """Test the file type selection of the load function"""
+    settings.database_ip = Setting("128.0.0.1", "IP address of database")
+
+    tmp_cfg = tmp_path / "test.cfg"
+    tmp_cfg.write_text('database_ip = "0.0.0.1"')
+
+    # The file type can't be inferred from the '.cfg' extension
+    with pytest.raises(NotImplementedError):
+        load(tmp_cfg, settings)
+
+    # The file type can be specified explicitly
+    load(tmp_cfg, settings, FileType.TOML)
+    assert settings.database_ip.value == "0.0.0.1"
+
+
+def test_settings_manager_load_toml_stream(settings: SettingsManager) -> None:
+    """Test the SettingsManager load_toml method with text and binary streams."""
+    settings.database_ip = Setting("128.0.0.1", "IP address of database")
+
+    load_toml(StringIO('database_ip = "0.0.0.1"'), settings)
+    assert settings.database_ip.value == "0.0.0.1"
+
+    load_toml(BytesIO(b'database_ip = "0.0.0.2"'), settings)
+    assert settings.database_ip.value == "0.0.0.2"
+
+
+def test_parse_toml_cache(tmp_path: Path) -> None:
+    """Test the caching of parsed TOML files"""
+    tmp_toml = tmp_path / "test.toml"
+    tmp_toml.write_text('database_ip = "0.0.0.1"\nopts = {a = [1]}')
+    key = str(tmp_toml.absolute())
+
+    # The parsed document is reused if the file hasn't changed
+    doc = parse_toml(tmp_toml)
+    cached = _parse_cache[key]
+    assert doc["database_ip"] == "0.0.0.1"
+    assert parse_toml(tmp_toml) == doc
+    assert _parse_cache[key] is cached
+
+    # Changing the returned document doesn't change the cached document
+    doc["opts"]["a"].append(99)
+    assert parse_toml(tmp_toml)["opts"]["a"] == [1]
+
+    # The file is parsed again if it has changed
+    tmp_toml.write_text('database_ip = "128.0.0.1"')
+    new_doc = parse_toml(tmp_toml)
+    assert _parse_cache[key] is not cached
+    assert new_doc["database_ip"] == "128.0.0.1"
+
+    # The cache can be cleared
+    clear_parse_cache()
+    assert key not in _parse_cache
+
+
+def test_parse_toml_cache_size(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that the least recently used parsed TOML files are dropped"""
+    monkeypatch.setattr(thatway.io, "_parse_cache_size", 2)
+    clear_parse_cache()
+
+    paths = [tmp_path / f"test{i}.toml" for i in range(3)]
+    for path in paths:
+        path.write_text(f'database_ip = "{path.name}"')
+
+    parse_toml(paths[0])
+    parse_toml(paths[1])
+    parse_toml(paths[0])  # most recently used
+    parse_toml(paths[2])
+
+    assert list(_parse_cache) == [str(paths[0].absolute()), str(paths[2].absolute())]
+
+
+def test_settings_manager_load_toml_cache(
+    settings: SettingsManager, tmp_path: Path
+) -> None:
+    """Test that loaded settings don't share values with the parse cache"""
+    settings.opts = Setting({"a": [1]}, "Options")
+
+    tmp_toml = tmp_path / "test.toml"
+    tmp_toml.write_text("opts = {a = [1, 2]}")
+
+    load(tmp_toml, settings)
+    settings.opts.value["a"].append(99)
+
+    # Loading the unchanged file again gives the file's values
+    load(tmp_toml, settings)
+    assert settings.opts.value == {"a": [1, 2]}
+
+
 def test_settings_manager_load_toml_missing(
     settings: SettingsManager, tmp_path: Path
 ) -> None:
@@ -106,3 +265,34 @@ def test_settings_manager_save_toml(
     toml = tmp_toml.read_text()
 
     assert match_strings(toml, key)
+
+
+def test_settings_manager_save_toml_failure(
+    settings: SettingsManager, tmp_path: Path
+) -> None:
+    """Test that a failed save doesn't overwrite an existing settings file"""
+    tmp_toml = tmp_path / "test.toml"
+    tmp_toml.write_text('database_ip = "0.0.0.1"')
+
+    # Values that can't be converted to TOML raise an exception
+    settings.obj = Setting(object(), "An object")
+
+    with pytest.raises(TypeError):
+        save(tmp_toml, settings)
+
+    assert tmp_toml.read_text() == 'database_ip = "0.0.0.1"'
+
+
+def test_settings_manager_save_load_utf8(
+    settings: SettingsManager, tmp_path: Path
+) -> None:
+    """Test that settings with non-ASCII text are saved and loaded as UTF-8"""
+    tmp_toml = tmp_path / "test.toml"
+    settings.greeting = Setting("héllo", "A greeting, en français")
+
+    save(tmp_toml, settings)
+    assert "héllo" in tmp_toml.read_text(encoding="utf-8")
+
+    settings.greeting.value = "bye"
+    load(tmp_toml, settings)
+    assert settings.greeting.value == "héllo"
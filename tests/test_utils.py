@@ -28,3 +28,17 @@ def test_settings_manager_locate(settings_set1: SettingsManager) -> None:
     filename = list(locations.keys())[0]
     assert filename.endswith("conftest.py")
     assert len(locations[filename]) == 3  # There are 3 settings in settings_set1
+
+
+def test_settings_manager_locate_nested(settings: SettingsManager) -> None:
+    """Test the SettingsManager location function for settings from one file in
+    different managers"""
+    settings.value1 = Setting(5, "A setting")
+    settings.sub.value2 = Setting(5, "Another setting")
+
+    locations = locate(settings)
+
+    assert len(locations) == 1
+    filename = list(locations.keys())[0]
+    assert filename.endswith("test_utils.py")
+    assert len(locations[filename]) == 2
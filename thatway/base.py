@@ -1,8 +1,9 @@
 from __future__ import annotations
 
 import copy
-import inspect
-from threading import Lock
+import copyreg
+import sys
+from functools import lru_cache
 from types import SimpleNamespace
 from typing import Any, Callable, ClassVar, Generic, Iterator, TypeVar, cast, overload
 from weakref import ReferenceType, ref
@@ -21,6 +22,18 @@ __all__ = (
 Value = TypeVar("Value")
 Instance = TypeVar("Instance")
 
+#: Attribute names of the hierarchy metadata stored in a settings manager's __dict__
+_hierarchy_attributes = frozenset(("__parent__", "__parent_key__"))
+
+#: Sentinel for missing instance values, which may legitimately be None
+_MISSING = object()
+
+
+@lru_cache(maxsize=None)
+def _module_keys(module: str) -> tuple[str, ...]:
+    """The settings manager keys for a module name. e.g. ('thatway', 'base')"""
+    return tuple(module.split("."))
+
 
 # Exceptions
 
@@ -37,54 +50,80 @@ class ConditionFailure(SettingException):
 
 
 class HierarchyMixin:
+    """The parent and name of settings and settings managers in the hierarchy.
+
+    These are stored under reserved dunder names, in the slots (Setting) or the
+    instance dict (SettingsManager), so that they don't collide with the names of
+    settings in a settings manager's namespace.
+    """
+
+    __slots__ = ()
 
     #: A weak reference to the parent settings manager that owns this object
-    _parent: ReferenceType[SettingsManager]
+    __parent__: ReferenceType[SettingsManager] | None = None
+
+    #: The name of this object in the parent settings manager
+    __parent_key__: str = ""
 
     @property
     def parent(self) -> SettingsManager | None:
-        weakref = self.__dict__.get("_parent", None)
+        weakref = self.__parent__
         return weakref() if weakref is not None else None
 
     @parent.setter
     def parent(self, value: SettingsManager) -> None:
         assert isinstance(value, SettingsManager)
-        self.__dict__["_parent"] = ref(value)
+        # Bypass SettingsManager.__setattr__
+        object.__setattr__(self, "__parent__", ref(value))
 
     @property
     def name(self) -> str:
         """The given name of this object from the parent"""
-        parent = self.parent
-        if parent is None:
-            return ""
-
-        # Find this object in the parent's dict
-        for name, obj in parent.__dict__.items():
-            if id(obj) == id(self):
-                return name
-
-        # Oops, name not found!
-        raise AttributeError(f"Name for {self} not found.")
+        return self.__parent_key__
 
     @property
     def full_name(self) -> str:
         """The full name, including parents, grandparents, etc. These are separated by
         a '.'"""
-        names: list[str] = [self.name]
-        parent = self.parent
+        names: list[str] = []
+        obj: HierarchyMixin | None = self
 
-        while parent is not None:
-            names.append(parent.name)
+        while obj is not None:
+            # The root settings manager has no name
+            if obj.name:
+                names.append(obj.name)
+            obj = obj.parent
 
         return ".".join(names[::-1])
 
+    def _attach(self, parent: SettingsManager, name: str) -> None:
+        """Set the parent settings manager and the name given by the parent"""
+        self.parent = parent
+        object.__setattr__(self, "__parent_key__", name)
+
 
 class Setting(Generic[Value], HierarchyMixin):
     """A validated setting"""
 
+    __slots__ = (
+        "_value",
+        "_value_type",
+        "desc",
+        "conditions",
+        "__location__",
+        "_attr_name",
+        "_manager_setting",
+        "__parent__",
+        "__parent_key__",
+        "__weakref__",
+    )
+
     #: The descriptor value for the setting. Accessed and set first.
     _value: Value
 
+    #: The type of the default value, used to convert values loaded from files
+    _value_type: type[Value]
+
     #: The setting description
     desc: str
 
@@ -95,6 +134,12 @@ class Setting(Generic[Value], HierarchyMixin):
     #: The location (filename, line no) in which the setting was created
     __location__: tuple[str, int]
 
+    #: The attribute name of this descriptor in the class that owns it
+    _attr_name: str
+
+    #: A weak reference to this setting's copy in the settings manager
+    _manager_setting: ReferenceType[Setting]
+
     #: Setting attribute name for the instance of the class that owns this descriptor
     _setting_attribute: ClassVar[str] = "__instance_settings__"
 
@@ -118,34 +163,72 @@ class Setting(Generic[Value], HierarchyMixin):
 
             - conditions (callable). A listing of functions that take a setting value
               and checks whether it's valid for this setting
+
+        Raises
+        ------
+        SettingException
+            Raised if a condition is not a function
         """
-        # Parse the opts
+        # Parse the opts. Conditions are checked once here, so that validation only
+        # needs to call them
         str_opts = tuple(o for o in opts if isinstance(o, str))
-        callable_opts = tuple(o for o in opts if callable(o))
+        callable_opts = tuple(o for o in opts if not isinstance(o, str))
+
+        for c in callable_opts:
+            if not callable(c):
+                raise SettingException(
+                    f"The following condition must be a function: {c}"
+                )
 
         # Assign the description from the kwarg first, then from the (*opts)
         self.desc = str_opts[0] if str_opts else ""
         self.conditions = callable_opts
-        self.value = cast(Value, value)  # After the conditions are set to validate
+        self.validate(value)  # After the conditions are set
+        self._value = cast(Value, value)
+        self._value_type = type(value)
+        self._attr_name = ""  # Set when the descriptor is assigned to a class
+        self.__parent__ = None  # Set when the setting is inserted in a settings manager
+        self.__parent_key__ = ""
 
         # Add meta information on where this object was instantiated
-        stack_trace = inspect.stack()
-        self.__location__ = (stack_trace[1][1], stack_trace[1][2])
+        frame = sys._getframe(1)  # the caller's frame
+        self.__location__ = (frame.f_code.co_filename, frame.f_lineno)
 
     def __repr__(self) -> str:
         name = getattr(self, "name", "")
         value = getattr(self, "value", "")
         return f"Setting({name}={value})"
 
+    def __copy__(self) -> Setting[Value]:
+        """A shallow copy of the setting, which is inserted in settings managers.
+
+        The reference to the manager setting (_manager_setting) is not copied because
+        it's only used by the descriptor.
+        """
+        cp = object.__new__(type(self))
+
+        # Copy the slots that are set, including the slots declared by subclasses
+        for name in copyreg._slotnames(type(self)):  # type: ignore[attr-defined]
+            value = getattr(self, name, _MISSING)
+            if name != "_manager_setting" and value is not _MISSING:
+                setattr(cp, name, value)
+
+        # Subclasses without __slots__ keep their own state in an instance dict
+        instance_dict = getattr(self, "__dict__", None)
+        if instance_dict is not None:
+            cp.__dict__.update(instance_dict)
+
+        return cp
+
     def __set_name__(self, cls: type[Instance], name: str) -> None:
         """Called during descriptor creation on class creation with the given
         attribute (name)
         """
-        # Construct or determine the location
-        location = cls.__module__.split(".") + [cls.__name__, name]
+        # Store the attribute name used to store instance values
+        self._attr_name = name
 
-        # Insert this descriptor in the settings
-        self._insert(*location)
+        # Insert this descriptor in the settings at its location
+        self._insert(*_module_keys(cls.__module__), cls.__name__, name)
 
     @overload
     def __get__(
@@ -182,18 +265,22 @@ class Setting(Generic[Value], HierarchyMixin):
         if obj is None:
             return self
 
-        # 1. Try getting the custom value from the instance
-        instance_settings = self._instance_settings(obj)
-        if self.name in instance_settings:
-            return instance_settings[self.name]
+        # 1. Try getting the custom value from the instance. The instance settings
+        # dict is only created when a value is set, not on reads
+        instance_settings = obj.__dict__.get(self._setting_attribute)
+        if instance_settings is not None:
+            value = instance_settings.get(self._attr_name, _MISSING)
+            if value is not _MISSING:
+                return value
 
-        # 2. Try the global settings manager
+        # 2. Try the global settings manager. The values are read from the slots
+        # directly, rather than through the value property
         manager_setting = self._manager_setting()
         if manager_setting is not None:
-            return manager_setting.value
+            return manager_setting._value
 
         # 3. Return the default value
-        return self.value
+        return self._value
 
     def __set__(self, obj: Instance, value: Value) -> None:
         # Validate the value
@@ -201,13 +288,13 @@ class Setting(Generic[Value], HierarchyMixin):
 
         # Change the setting
         instance_settings = Setting._instance_settings(obj)
-        instance_settings[self.name] = cast(Value, value)
+        instance_settings[self._attr_name] = cast(Value, value)
 
     def __delete__(self, obj: Instance) -> None:
         instance_settings = self._instance_settings(obj)
-        if self.name not in instance_settings:
-            raise AttributeError(self.name)
-        del instance_settings[self.name]
+        if self._attr_name not in instance_settings:
+            raise AttributeError(self._attr_name)
+        del instance_settings[self._attr_name]
 
     @property
     def value(self) -> Value:
@@ -215,13 +302,14 @@ class Setting(Generic[Value], HierarchyMixin):
 
     @value.setter
     def value(self, v: Value) -> None:
-        self._value = v
+        # Validate first, so that an invalid value is not kept
         self.validate(v)
+        self._value = v
 
     @staticmethod
     def manager() -> SettingsManager:
         """Retrieve the global settings manager"""
-        return SettingsManager()
+        return SettingsManager._instance
 
     @classmethod
     def _instance_settings(cls, obj: Instance) -> dict:
@@ -242,10 +330,13 @@ class Setting(Generic[Value], HierarchyMixin):
             Raised if trying to insert this setting by something else already
             exists at that location in the settings.
         """
-        # Got through each key to access the corresponding namespace
+        # Got through each key to access (or create) the corresponding namespace.
+        # Sub-managers are created explicitly because names like '__main__' are not
+        # auto-created by SettingsManager.__getattribute__
         manager = self.manager()
         for key in keys[:-1]:
-            manager = getattr(manager, key)
+            item = manager.__dict__.get(key)
+            manager = manager._add_submanager(key) if item is None else item
 
         # Insert the setting
         setattr(manager, keys[-1], self)
@@ -269,92 +360,107 @@ class Setting(Generic[Value], HierarchyMixin):
 
         Raises
         ------
-        SettingException
-            Raised if a function is not a function
         ConditionFailure
             Raised when a condition fails to validate
         """
-        valid = True
-
-        # Sort the callable and non-callable validators
+        # The conditions are checked to be callable on creation
         for c in self.conditions:
-            if not callable(c):
-                raise SettingException(
-                    f"The following condition must be a function: {c}"
-                )
-
-            passed = c(value)
-
-            if not passed:
+            if not c(value):
                 # The condition function's docstring is used to annotate the exception
                 raise ConditionFailure(c.__doc__)
 
-            valid &= passed
-
-        return valid
+        return True
 
 
 class SettingsManager(HierarchyMixin, SimpleNamespace):
     """The settings namespace manager"""
 
-    #: The settings manager singleton
-    _instance: ClassVar[SettingsManager | None] = None
-
-    #: The thread lock for the singleton
-    _lock: ClassVar[Lock] = Lock()
+    #: The settings manager singleton. This is created eagerly when the module is
+    #: imported, which is thread-safe under the import lock.
+    _instance: ClassVar[SettingsManager]
 
     def __new__(cls, base: bool = True) -> SettingsManager:
-        """Return a thread-safe SettingsManager singleton"""
-        # If this is not the singleton base settings manager, create a new instance
-        if not base:
-            return super().__new__(cls)
-
-        # Otherwise return the singleton
-        if cls._instance is None:
-            with cls._lock:
-                # Another thread could have created the instance
-                # before we acquired the lock. So check that the
-                # instance is still nonexistent.
-                if not cls._instance:
-                    cls._instance = super().__new__(cls)
-        return cls._instance
+        """Return the SettingsManager singleton, or a new (sub-)manager if not base"""
+        return cls._instance if base else super().__new__(cls)
+
+    def __init__(self, base: bool = True) -> None:
+        # The base flag is only used by __new__, and it is not a namespace entry
+        super().__init__()
 
     def __repr__(self, level: int = 0, spacer: str = "  ") -> str:
-        name = self.name
+        lines: list[str] = []
+        self._repr_lines(lines, level, spacer)
+        return "\n".join(lines)
 
-        is_root = False if name else True  # Is this the root SettingsManager?
-        next_level = level + 1 if not is_root else level  # Calculate next spacing level
+    def _repr_lines(self, lines: list[str], level: int, spacer: str) -> None:
+        """Append the repr lines of this settings manager and its items to lines"""
+        name = self.name
 
-        header = f"{spacer * level}{self.name}\n" if not is_root else ""
-        subitems = []
+        # The root SettingsManager has no name, and it doesn't get a header
+        if name:
+            lines.append(f"{spacer * level}{name}")
+            level += 1
 
+        indent = spacer * level  # Calculate spacing once for the items
         for item in self:
             if isinstance(item, Setting):
-                subitems.append(f"{spacer * next_level}{item.name}={repr(item.value)}")
+                lines.append(f"{indent}{item.name}={repr(item.value)}")
             elif isinstance(item, SettingsManager):
-                subitems.append(item.__repr__(next_level, spacer))
-            else:
-                continue
-
-        return header + "\n".join(subitems)
+                item._repr_lines(lines, level, spacer)
+
+    def __eq__(self, other: object) -> bool:
+        """Settings managers are equal if they hold equal settings and sub-managers.
+        The same settings manager is always equal to itself. The position in the
+        hierarchy (parent and name) is not compared."""
+        if self is other:
+            return True
+        if not isinstance(other, SettingsManager):
+            return NotImplemented
+        return self._namespace() == other._namespace()
+
+    def __copy__(self) -> SettingsManager:
+        """A copy of the settings manager, which is inserted in settings managers.
+
+        The settings and sub-managers are copied and attached to the copy, so that the
+        original's hierarchy is not changed. The copy has no parent.
+        """
+        cp = SettingsManager(base=False)
+        for k, v in self._namespace().items():
+            item = copy.copy(v)
+            item._attach(cp, k)
+            cp.__dict__[k] = item
+        return cp
+
+    def _namespace(self) -> dict[str, Any]:
+        """The namespace entries, without the hierarchy metadata"""
+        return {
+            k: v for k, v in self.__dict__.items() if k not in _hierarchy_attributes
+        }
 
     def __iter__(self) -> Iterator[Setting | SettingsManager]:
         """An iterator of the settings and (non-empty) managers owned by this settings
         manager."""
         for i in self.__dict__.values():
-            if isinstance(i, Setting) or isinstance(i, SettingsManager) and len(i) > 0:
+            if isinstance(i, Setting) or (
+                isinstance(i, SettingsManager) and not i._is_empty()
+            ):
                 yield i
 
     def __len__(self) -> int:
         """The number of settings and (non-empy) managers owned by this settings
         manager."""
-        return len(list(self.__iter__()))
+        return sum(1 for _ in self)
+
+    def _is_empty(self) -> bool:
+        """Whether this settings manager owns no settings or (non-empty) managers.
+        Unlike len(), this stops at the first item found."""
+        return next(iter(self), None) is None
 
     def __setattr__(self, name: str, value: Setting | SettingsManager) -> None:
         """Set a setting in the settings manager namespace."""
         # See if this is a class attribute or instance attribute
         cls_attr = getattr(SettingsManager, name, None)
-        obj_attr = getattr(self, name, None)
+        obj_attr = self.__dict__.get(name, None)
 
         # Calculate flags
         has_cls_property = isinstance(cls_attr, property)  # cls has this as a property
@@ -362,7 +468,7 @@ class SettingsManager(HierarchyMixin, SimpleNamespace):
         is_setting = isinstance(obj_attr, Setting)  # attribute is setting
         is_submanager = isinstance(obj_attr, SettingsManager)  # attribute is submanager
         is_empty_submanager = (
-            isinstance(obj_attr, SettingsManager) and len(obj_attr) == 0
+            isinstance(obj_attr, SettingsManager) and obj_attr._is_empty()
         )
 
         # If it's a property, set it directly
@@ -370,7 +476,7 @@ class SettingsManager(HierarchyMixin, SimpleNamespace):
             return super().__setattr__(name, value)
 
         # Check that the value is either a Setting or a SettingsManager
-        if not isinstance(value, Setting | SettingsManager):
+        if not isinstance(value, (Setting, SettingsManager)):
             raise AttributeError(
                 f"Cannot insert value of type '{type(value)}' in a SettingsManager."
             )
@@ -378,7 +484,7 @@ class SettingsManager(HierarchyMixin, SimpleNamespace):
         # Only replace missing attributes or empty submanagers
         if not has_obj_attr or is_empty_submanager:
             cp = copy.copy(value)  # shallow copy
-            cp.parent = self
+            cp._attach(self, name)
             return super().__setattr__(name, cp)
 
         # At this stage, the attribute could not be set. Create a customized exception
@@ -394,11 +500,33 @@ class SettingsManager(HierarchyMixin, SimpleNamespace):
 
     def __getattribute__(self, name: str) -> Setting | SettingsManager:
         """Return the setting or a new sub-namespace of settings"""
-        try:
+        # Dunder attributes are looked up normally and never create sub-managers
+        if name.startswith("__"):
             return super().__getattribute__(name)
-        except AttributeError:
-            # Create a new sub-manager
-            manager = SettingsManager(base=False)
-            manager.parent = self
-            self.__dict__[name] = manager
+
+        # Settings and sub-managers are stored in the instance's dict
+        item = super().__getattribute__("__dict__").get(name, None)
+        if item is not None:
+            return item
+
+        # Class attributes (methods, properties) and invalid names are looked up
+        # normally. Only valid names can be sub-managers. The metaclass's attributes,
+        # like 'mro', are not class attributes, so hasattr(type(self)) isn't used
+        if not name.isidentifier() or any(
+            name in cls.__dict__ for cls in type(self).__mro__
+        ):
             return super().__getattribute__(name)
+
+        # Create a new sub-manager
+        return self._add_submanager(name)
+
+    def _add_submanager(self, name: str) -> SettingsManager:
+        """Create and return a new (empty) sub-manager with the given name"""
+        manager = SettingsManager(base=False)
+        manager._attach(self, name)
+        self.__dict__[name] = manager
+        return manager
+
+
+# Create the settings manager singleton
+SettingsManager._instance = SettingsManager(base=False)
@@ -32,7 +32,8 @@ def greater_than(
     def _greater_than(value: SupportsRichComparison) -> bool:
         return value > other
 
-    _greater_than.__doc__ = greater_than.__doc__
+    if isinstance(greater_than.__doc__, str):
+        _greater_than.__doc__ = greater_than.__doc__.format(other=other)
     return _greater_than
 
 
@@ -44,39 +45,28 @@ def lesser_than(
     def _lesser_than(value: SupportsRichComparison) -> bool:
         return value < other
 
-    _lesser_than.__doc__ = greater_than.__doc__
+    if isinstance(lesser_than.__doc__, str):
+        _lesser_than.__doc__ = lesser_than.__doc__.format(other=other)
     return _lesser_than
 
 
 def is_positive(value: SupportsRichComparison) -> bool:
     """Value must be positive"""
-    if isinstance(value, int):
-        return value > 0
-    elif isinstance(value, float):
-        return value > 0.0
-    else:
-        raise NotImplementedError
+    return value > 0
 
 
 def is_negative(value: SupportsRichComparison) -> bool:
     """Value must be negative"""
-    if isinstance(value, int):
-        return value < 0
-    elif isinstance(value, float):
-        return value < 0.0
-    else:
-        raise NotImplementedError
+    return value < 0
 
 
 def within(
     minimum: SupportsRichComparison, maximum: SupportsRichComparison
 ) -> Callable[[SupportsRichComparison], bool]:
     """Value must be within {minimum} and {maximum}."""
-    min_func = greater_than(minimum)
-    max_func = lesser_than(maximum)
 
     def _within(value: SupportsRichComparison) -> bool:
-        return min_func(value) and max_func(value)
+        return minimum < value < maximum
 
     if isinstance(within.__doc__, str):
         _within.__doc__ = within.__doc__.format(minimum=minimum, maximum=maximum)
@@ -1,20 +1,28 @@
 """
 SettingsManager I/O methods
+
+Settings files are parsed with the standard library's tomllib, and they are written
+with tomlkit, which preserves the settings descriptions as comments. Both are imported
+by the functions that use them, so that importing thatway doesn't pay their import
+cost when settings are never loaded or saved.
 """
 
+from __future__ import annotations
+
+import copy
+from collections import OrderedDict
+from datetime import date, datetime, time
 from enum import Enum, auto
 from io import IOBase, StringIO
 from pathlib import Path
-from typing import IO
-
-from tomlkit import TOMLDocument, document
-from tomlkit import dump as _dump_toml
-from tomlkit import load as _load_toml
-from tomlkit import table
-from tomlkit.items import Item, Table
+from typing import IO, TYPE_CHECKING, Any
 
 from .base import Setting, SettingException, SettingsManager
 
+if TYPE_CHECKING:
+    from tomlkit import TOMLDocument
+    from tomlkit.items import Table
+
 __all__ = ("load", "save", "pprint", "FileType")
 
 
@@ -25,6 +33,21 @@ class FileType(Enum):
     TOML = auto()
 
 
+#: The file types of settings file extensions, used to infer FileType.AUTO
+_suffix_filetypes: dict[str, FileType] = {".toml": FileType.TOML}
+
+#: Immutable value types that are loaded as-is when they match the setting's type
+_immutable_types = frozenset((str, int, float, bool, datetime, date, time))
+
+#: Parsed settings files, ordered from least to most recently used. The keys are the
+#: file paths, and the values are the file's (modification time, size) and the parsed
+#: document. The cached documents are never handed out directly.
+_parse_cache: OrderedDict[str, tuple[tuple[int, int], dict[str, Any]]] = OrderedDict()
+
+#: The maximum number of parsed settings files to cache
+_parse_cache_size = 32
+
+
 def load(
     filepath: Path,
     settings: SettingsManager | None = None,
@@ -46,11 +69,70 @@ def load(
     settings = settings if settings is not None else SettingsManager()
 
     # Determine the filetype
-    if filetype is FileType.TOML or FileType.AUTO and filepath.suffix in (".toml",):
-        with filepath.open(mode="r") as stream:
-            load_toml(stream, settings=settings)
+    if filetype is FileType.AUTO:
+        filetype = _suffix_filetypes.get(filepath.suffix, filetype)
+
+    if filetype is FileType.TOML:
+        # The cached document is used directly because load_toml copies the values
+        load_toml(_parse_toml(filepath), settings=settings)
     else:
-        raise NotImplementedError
+        raise NotImplementedError(f"Unsupported settings file type for '{filepath}'")
+
+
+def parse_toml(filepath: Path) -> dict[str, Any]:
+    """Parse a TOML settings file.
+
+    The parsed data is cached and reused until the file's modification time
+    or size changes. A rewrite that keeps both the size and the modification time,
+    like on filesystems with coarse timestamps or a copy that preserves timestamps
+    (cp -p), is not detected, and the previously parsed data is returned. Use
+    :func:`clear_parse_cache` in that case.
+
+    Parameters
+    ----------
+    filepath
+        The path of the TOML file to parse.
+
+    Returns
+    -------
+    data
+        The parsed TOML data. This is a copy, which can be modified without
+        changing the cached data.
+    """
+    return copy.deepcopy(_parse_toml(filepath))
+
+
+def _parse_toml(filepath: Path) -> dict[str, Any]:
+    """Parse a TOML settings file, and return the cached document itself. This must
+    not be modified."""
+    stat = filepath.stat()
+    key = str(filepath.absolute())
+    version = (stat.st_mtime_ns, stat.st_size)
+
+    # Reuse the parsed document, if the file hasn't changed
+    cached = _parse_cache.get(key, None)
+    if cached is not None and cached[0] == version:
+        _parse_cache.move_to_end(key)
+        return cached[1]
+
+    import tomllib
+
+    with filepath.open(mode="rb") as stream:
+        data = tomllib.load(stream)
+
+    # Cache the parsed document, and drop the least recently used one if needed
+    _parse_cache[key] = (version, data)
+    _parse_cache.move_to_end(key)
+    if len(_parse_cache) > _parse_cache_size:
+        _parse_cache.popitem(last=False)
+
+    return data
+
+
+def clear_parse_cache() -> None:
+    """Clear the cache of parsed settings files, so that they're parsed again on the
+    next load."""
+    _parse_cache.clear()
 
 
 def save(
@@ -74,11 +156,17 @@ def save(
     settings = settings if settings is not None else SettingsManager()
 
     # Determine the filetype
-    if filetype is FileType.TOML or FileType.AUTO and filepath.suffix in (".toml",):
-        with filepath.open(mode="w") as stream:
+    if filetype is FileType.AUTO:
+        filetype = _suffix_filetypes.get(filepath.suffix, filetype)
+
+    if filetype is FileType.TOML:
+        # Render the settings before writing them in a single call, so that a
+        # failure doesn't truncate an existing settings file. TOML files are UTF-8
+        with StringIO() as stream:
             save_toml(stream, settings=settings)
+            filepath.write_text(stream.getvalue(), encoding="utf-8")
     else:
-        raise NotImplementedError
+        raise NotImplementedError(f"Unsupported settings file type for '{filepath}'")
 
 
 def pprint(
@@ -111,14 +199,17 @@ def pprint(
 
 
 def load_toml(
-    input: IO[str] | TOMLDocument | Table, settings: SettingsManager | None = None
+    input: IO[str] | IO[bytes] | dict[str, Any],
+    settings: SettingsManager | None = None,
 ) -> None:
     """Load settings namespace from TOML.
 
     Parameters
     ----------
     input
-        The path or TOML object to load data from.
+        The file-like object or parsed TOML data (dict) to load data from. Text
+        streams and binary streams (UTF-8), like files opened with mode "rb", are
+        both accepted.
     settings
         The settings manager namespace to load settings into
 
@@ -130,34 +221,59 @@ def load_toml(
     NotImplementedError
         An unknown input type was inserted
     """
+    import tomllib
+
     settings = settings if settings is not None else SettingsManager()
 
     if isinstance(input, IOBase):
-        document = _load_toml(input)
-        return load_toml(document, settings)
+        # tomllib only parses str, so binary streams are decoded first
+        data = input.read()
+        text = data.decode("utf-8") if isinstance(data, bytes) else data
+        return load_toml(tomllib.loads(text), settings)
+
+    elif isinstance(input, dict):
+        # Walk the tables and their settings managers with a stack of
+        # (table, settings manager) pairs
+        stack = [(input, settings)]
 
-    elif isinstance(input, TOMLDocument | Table):
+        while stack:
+            table, manager = stack.pop()
 
-        for k, v in input.items():
             # Retrieve from the __dict__ directly because the __getattribute__
             # returns an empty sub-SettingsManager by default
-            sub_setting = settings.__dict__.get(k, None)
-
-            if isinstance(sub_setting, SettingsManager):
-                # Parse the sub-namespace
-                load_toml(v, sub_setting)
-
-            elif isinstance(sub_setting, Setting):
-                # Get the type of the default
-                type_default = type(sub_setting.value)
-
-                # Change the setting and force the type conversion
-                sub_setting.value = type_default(v)
-
-            else:
-                raise SettingException(
-                    f"Setting '{k}' could not be found in the settings."
-                )
+            namespace = manager.__dict__
+
+            for k, v in table.items():
+                sub_setting = namespace.get(k, None)
+
+                if isinstance(sub_setting, SettingsManager):
+                    # Parse the sub-namespace
+                    if not isinstance(v, dict):
+                        raise NotImplementedError(
+                            f"Input type '{type(v)}' unsupported."
+                        )
+                    stack.append((v, sub_setting))
+
+                elif isinstance(sub_setting, Setting):
+                    # Get the type of the default
+                    type_default = sub_setting._value_type
+
+                    # Change the setting and force the type conversion. Immutable
+                    # values with the default's type are used as-is, while other
+                    # values are converted. Containers are deep copied, so that
+                    # settings don't share nested values with the input data
+                    if isinstance(v, (list, dict)):
+                        v = type_default(copy.deepcopy(v))
+                    elif not (
+                        type(v) is type_default and type_default in _immutable_types
+                    ):
+                        v = type_default(v)
+                    sub_setting.value = v
+
+                else:
+                    raise SettingException(
+                        f"Setting '{k}' could not be found in the settings."
+                    )
 
     else:
         raise NotImplementedError(f"Input type '{type(input)}' unsupported.")
@@ -175,6 +291,10 @@ def save_toml(
     settings
         The settings manager namespace to read settings from
     """
+    from tomlkit import TOMLDocument, document, item, table
+    from tomlkit import dump as _dump_toml
+    from tomlkit.items import Table
+
     settings = settings if settings is not None else SettingsManager()
 
     if isinstance(output, IOBase):
@@ -187,27 +307,34 @@ def save_toml(
         # Open the file path, and write the given document
         _dump_toml(doc, output)
 
-    elif isinstance(output, TOMLDocument | Table):
-
-        # Iterate over the items in the namespace
-        for k, v in settings.__dict__.items():
-            if isinstance(v, SettingsManager):
-                # If it's a SettingsManager, create a new sub-table
-                tab = table()
-                save_toml(tab, v)
-                output[k] = tab
-
-            elif isinstance(v, Setting):
-                # If it's a setting, enter it directly
-                output[k] = v.value
-
-                # Add a comment for the description
-                item = output[k]
-                if hasattr(v, "desc") and isinstance(item, Item):
-                    item.comment(v.desc)
-
-            else:
-                continue
+    elif isinstance(output, (TOMLDocument, Table)):
+        # Walk the settings managers and their tables with a stack of
+        # (settings manager, table) pairs
+        stack: list[tuple[SettingsManager, TOMLDocument | Table]] = [(settings, output)]
+
+        while stack:
+            manager, container = stack.pop()
+
+            # Iterate over the items in the namespace
+            for k, v in manager.__dict__.items():
+                if isinstance(v, SettingsManager):
+                    # If it's a SettingsManager, create a new sub-table. The table is
+                    # added in place, so that the keys keep their order, and it's
+                    # filled when it's taken from the stack
+                    tab = table()
+                    container[k] = tab
+                    stack.append((v, tab))
+
+                elif isinstance(v, Setting):
+                    # If it's a setting, create the item with a comment for the
+                    # description, if it has one, and enter it once
+                    toml_item = item(v.value)
+                    if v.desc:
+                        toml_item.comment(v.desc)
+                    container[k] = toml_item
+
+                else:
+                    continue
 
     else:
         raise NotImplementedError
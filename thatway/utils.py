@@ -1,7 +1,5 @@
 """Utility functions for SettingsManager and Setting objects"""
 
-import inspect
-
 from .base import Setting, SettingsManager
 
 __all__ = ("clear", "locate")
@@ -17,8 +15,12 @@ def clear(settings: SettingsManager | None = None) -> None:
     """
     settings = settings if settings is not None else SettingsManager()
 
-    deletable_items = list(settings)
-    deletable_attrs = [k for k, v in settings.__dict__.items() if v in deletable_items]
+    # Match items by identity. Comparing with 'in' on a list compares managers by
+    # value, which walks their contents for every attribute
+    deletable_ids = {id(item) for item in settings}
+    deletable_attrs = [
+        k for k, v in settings.__dict__.items() if id(v) in deletable_ids
+    ]
 
     for attr in deletable_attrs:
         delattr(settings, attr)
@@ -40,15 +42,20 @@ def locate(settings: SettingsManager | None = None) -> dict[str, dict[int, Setti
     """
     settings = settings if settings is not None else SettingsManager()
 
-    # Organize the settings
+    # Organize the settings, walking the settings managers with a stack
     locations: dict[str, dict[int, Setting]] = dict()
-    for item in settings:
-        if isinstance(item, Setting):
-            filename, lineno = getattr(item, "__location__", ("UNKNOWN", -1))
-            locations.setdefault(filename, dict())[lineno] = item
-        elif isinstance(item, SettingsManager):
-            locations.update(locate(item))
-        else:
-            continue
+    managers = [settings]
+
+    while managers:
+        manager = managers.pop()
+
+        for item in manager.__dict__.values():
+            if isinstance(item, Setting):
+                filename, lineno = getattr(item, "__location__", ("UNKNOWN", -1))
+                locations.setdefault(filename, dict())[lineno] = item
+            elif isinstance(item, SettingsManager):
+                managers.append(item)
+            else:
+                continue
 
     return locations